@@ -0,0 +1,121 @@
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from generated.stately_item_types import Link, Profile
+from app.stately_client import LinkStream
+from app.views import render_profile_edit_page, stream_profile_edit_page
+
+MODES = ('buffered', 'streaming')
+
+
+def _make_profile() -> Profile:
+    return Profile(
+        id='bench',
+        full_name='Benchmark Creator',
+        slug='bench',
+        profile_image='🌟',
+        bio='Welcome to my profile!',
+        is_active=True,
+        view_count=1
+    )
+
+
+def _make_link(i: int, order: int) -> Link:
+    return Link(
+        id=i,
+        profile_id='bench',
+        title=f'Link number {i}',
+        url=f'https://example.com/links/{i}',
+        emoji='🔗',
+        link_type='website',
+        description=f'Description for link number {i}',
+        is_active=True,
+        order=order,
+        click_count=i
+    )
+
+
+async def _iter_links(count: int):
+    for i in range(1, count + 1):
+        # Reverse the key order so the buffered path has real sorting to do
+        yield _make_link(i, count - i + 1)
+        # Hand control back to the loop like a real list page fetch would
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor
+
+
+async def _measure(mode: str, count: int) -> dict:
+    request = RequestFactory().get('/bench/edit/')
+    profile = _make_profile()
+
+    # Warm the template cache so compilation is not part of the measurement
+    render_profile_edit_page(request, profile, [_make_link(1, 1)])
+    baseline_rss = _peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == 'buffered':
+        # get_profile_and_links pages through and materializes every link first
+        links = [link async for link in _iter_links(count)]
+        response = render_profile_edit_page(request, profile, links)
+        body = response.content
+        ttfb = total = time.perf_counter() - start
+        size = len(body)
+    else:
+        response = stream_profile_edit_page(request, profile, LinkStream('bench', _iter_links(count)))
+        chunks = aiter(response.streaming_content)
+        size = len(await anext(chunks))
+        ttfb = time.perf_counter() - start
+        async for chunk in chunks:
+            size += len(chunk)
+        total = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'links': count,
+        'ttfb_ms': round(ttfb * 1000, 1),
+        'total_ms': round(total * 1000, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'peak_rss_growth_mb': round(_peak_rss_mb() - baseline_rss, 1),
+        'body_kb': round(size / 1024, 1),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare time-to-first-byte and peak RSS of buffered and streamed profile edit pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--links', type=int, default=5000, help='Number of links on the profile')
+        parser.add_argument('--mode', choices=MODES, help='Measure one mode in this process and print JSON')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            result = asyncio.run(_measure(options['mode'], options['links']))
+            self.stdout.write(json.dumps(result))
+            return
+
+        # Peak RSS never goes down, so each mode runs in a fresh process
+        results = []
+        for mode in MODES:
+            proc = subprocess.run(
+                [sys.executable, sys.argv[0], 'bench_profile_edit', '--links', str(options['links']), '--mode', mode],
+                capture_output=True, text=True, check=True
+            )
+            results.append(json.loads(proc.stdout))
+
+        columns = ('mode', 'links', 'ttfb_ms', 'total_ms', 'peak_rss_mb', 'peak_rss_growth_mb', 'body_kb')
+        self.stdout.write(''.join(f'{column:>20}' for column in columns))
+        for result in results:
+            self.stdout.write(''.join(f'{result[column]:>20}' for column in columns))
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import logging
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+# Root frame for samples taken while the request was suspended on an await
+AWAIT_ROOT = '[await]'
+# Stands in for frames hidden behind an async generator's asend/athrow object
+ASYNC_GEN_FRAME = '[async generator]'
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get('__name__', '?')
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+class RequestProfiler:
+    """Low-overhead stack sampler for a single in-flight async request.
+
+    A background thread periodically looks at the event loop thread. If the
+    request's middleware frame is on the stack, the request is running Python
+    code and the stack above it is recorded as a CPU sample. Otherwise the
+    request is suspended, and the coroutine await chain is recorded under
+    ``[await]`` instead.
+
+    A CPU-bound loop thread holds the GIL and delays the sampler, so each
+    sample is weighted by the time since the previous one rather than counted.
+
+    If the request's task ends without the profiler being stopped, for
+    example because a streamed body was never sent, the sampler thread
+    finishes the profile itself.
+    """
+
+    def __init__(self, request, interval: float):
+        self.method = request.method
+        self.path = request.path
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.task = asyncio.current_task()
+        self.anchor = None
+        self.stacks = Counter()
+        self.cpu_time = 0.0
+        self.await_time = 0.0
+        self.sections = Counter()
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._last_sample = 0.0
+        self._stopped = threading.Event()
+        self._thread = None
+        self._finish_lock = threading.Lock()
+        self._finished = False
+
+    def start(self, anchor) -> None:
+        self.anchor = anchor
+        self.started = self._last_sample = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        # Drop frame references so the request's locals can be collected
+        self.anchor = None
+        self.task = None
+
+    def finish(self) -> None:
+        """Stop sampling and write the profile, at most once."""
+        with self._finish_lock:
+            if self._finished:
+                return
+            self._finished = True
+        self.stop()
+        try:
+            stem = self.dump()
+            logger.info(f"Profiled {self.method} {self.path} in {self.elapsed * 1000:.1f}ms: {stem}")
+        except OSError as e:
+            logger.error(f"Error writing profile for '{self.path}': {e}")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            task = self.task
+            if task is not None and task.done():
+                self.finish()
+                return
+            self._sample()
+
+    def _sample(self) -> None:
+        now = time.perf_counter()
+        weight = now - self._last_sample
+        self._last_sample = now
+
+        frame = sys._current_frames().get(self.thread_id)
+        running = []
+        while frame is not None:
+            if frame is self.anchor:
+                break
+            running.append(_frame_name(frame))
+            frame = frame.f_back
+
+        if frame is not None:
+            self.cpu_time += weight
+            stack = running[::-1]
+        else:
+            self.await_time += weight
+            stack = [AWAIT_ROOT] + self._await_chain()
+        self.stacks[';'.join(stack)] += weight
+
+    def _await_chain(self) -> list[str]:
+        """Walk the suspended task's coroutines below the middleware frame.
+
+        ``async for`` awaits an asend object that doesn't expose the generator
+        behind it, so the walk ends there with a placeholder frame. Streamed
+        bodies are iterated through such objects above the anchor and only
+        ever get the placeholder.
+        """
+        names = []
+        inside = False
+        task = self.task
+        coro = task.get_coro() if task else None
+        while coro is not None:
+            frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'ag_frame', None)
+            if frame is None:
+                if inside and type(coro).__name__ in ('async_generator_asend', 'async_generator_athrow'):
+                    names.append(ASYNC_GEN_FRAME)
+                break
+            if inside:
+                names.append(_frame_name(frame))
+            elif frame is self.anchor:
+                inside = True
+            coro = getattr(coro, 'cr_await', None) or getattr(coro, 'ag_await', None)
+        return names if inside else [ASYNC_GEN_FRAME]
+
+    def add_section(self, name: str, seconds: float) -> None:
+        self.sections[name] += seconds
+
+    def summary(self) -> dict:
+        sampled = self.cpu_time + self.await_time
+        return {
+            'method': self.method,
+            'path': self.path,
+            'wall_ms': round(self.elapsed * 1000, 3),
+            'interval_ms': round(self.interval * 1000, 3),
+            'cpu_ms': round(self.cpu_time * 1000, 3),
+            'await_ms': round(self.await_time * 1000, 3),
+            'cpu_ratio': round(self.cpu_time / sampled, 3) if sampled else None,
+            'sections_ms': {name: round(seconds * 1000, 3) for name, seconds in self.sections.items()},
+        }
+
+    def server_timing(self) -> str:
+        # Streaming responses send headers while the profiler is still running
+        elapsed = self.elapsed if self._stopped.is_set() else time.perf_counter() - self.started
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.sections.items()]
+        parts.append(f"total;dur={elapsed * 1000:.1f}")
+        return ', '.join(parts)
+
+    def dump(self) -> str:
+        """Write collapsed stacks and a JSON summary, returning the file stem."""
+        output_dir = settings.PROFILE_OUTPUT_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+        stem = output_dir / f"{stamp}-{slugify(self.path) or 'root'}"
+
+        # One "frame;frame;frame weight" line per unique stack, the input
+        # format of flamegraph.pl and speedscope, weighted in microseconds
+        with open(f"{stem}.collapsed", 'w') as f:
+            for stack, seconds in self.stacks.most_common():
+                f.write(f"{stack} {round(seconds * 1_000_000)}\n")
+        with open(f"{stem}.json", 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+        # Keep only the newest profiles so sampling can't fill the disk; the
+        # timestamp prefix makes name order chronological
+        summaries = sorted(output_dir.glob('*.json'))
+        for old in summaries[:max(len(summaries) - settings.PROFILE_MAX_DUMPS, 0)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix('.collapsed').unlink(missing_ok=True)
+        return str(stem)
+
+
+def has_profile_token(request) -> bool:
+    """Whether the trigger header carries PROFILE_TOKEN; always False without one."""
+    token = settings.PROFILE_TOKEN
+    value = request.headers.get(settings.PROFILE_HEADER)
+    return bool(token) and value is not None and secrets.compare_digest(value.encode(), token.encode())
+
+
+def _sampled() -> bool:
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def should_profile(request) -> bool:
+    """Profile when the trigger header carries the token, or by sample rate."""
+    return has_profile_token(request) or _sampled()
+
+
+@contextmanager
+def timed(request, name: str):
+    """Record the wall time of a block against the request's profiler, if any."""
+    profiler = getattr(request, 'profiler', None)
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_section(name, time.perf_counter() - start)
+
+
+class ProfilingMiddleware:
+    """Opt-in per-request profiling for the async views."""
+
+    async_capable = True
+    sync_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        by_token = has_profile_token(request)
+        if not (by_token or _sampled()):
+            request.profiler = None
+            return await self.get_response(request)
+
+        profiler = RequestProfiler(request, settings.PROFILE_INTERVAL_MS / 1000)
+        request.profiler = profiler
+        profiler.start(sys._getframe())
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            profiler.stop()
+            raise
+
+        # Only the token holder sees timings; randomly sampled requests may
+        # come from anyone
+        if by_token:
+            response['Server-Timing'] = profiler.server_timing()
+        if response.streaming and response.is_async:
+            # Finished when the body is done; if it's never iterated, the
+            # sampler finishes the profile once the request's task ends
+            response.streaming_content = self._profile_stream(profiler, response.streaming_content)
+            return response
+
+        profiler.stop()
+        await asyncio.to_thread(profiler.finish)
+        return response
+
+    async def _profile_stream(self, profiler, content):
+        """Keep sampling until a streamed body has been fully sent."""
+        # The body is rendered after __call__ returns, under this frame instead
+        profiler.anchor = sys._getframe()
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            profiler.stop()
+            await asyncio.to_thread(profiler.finish)
@@ -1,7 +1,7 @@
 import os
 import asyncio
 import logging
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from uuid import UUID
 from generated.stately_item_types import Client, Link, Profile, key_path
 from statelydb.src.errors import StatelyError
@@ -28,15 +28,12 @@ stately_client = StatelyClient()
 
 
 async def get_profile_and_links(slug: str) -> tuple[Optional[Profile], List[Link]]:
-    """Get a profile and all its links with a single list call."""
+    """Get a profile and all its links, paging through the list."""
     try:
-        prefix = key_path("/p-{slug}", slug=slug)
-        list_resp = await stately_client.client.begin_list(prefix, limit=100)
-        
         profile = None
         links = []
 
-        async for item in list_resp:
+        async for item in _iter_list(key_path("/p-{slug}", slug=slug), page_size=100):
             if isinstance(item, Profile):
                 profile = item
             elif isinstance(item, Link):
@@ -48,6 +45,66 @@ async def get_profile_and_links(slug: str) -> tuple[Optional[Profile], List[Link
         return None, []
 
 
+async def _iter_list(prefix, page_size: int) -> AsyncIterator:
+    """Yield every item under a key path prefix, one list page at a time."""
+    list_resp = await stately_client.client.begin_list(prefix, limit=page_size)
+    while True:
+        async for item in list_resp:
+            yield item
+        token = list_resp.token
+        if not token.can_continue:
+            break
+        list_resp = await stately_client.client.continue_list(token)
+
+
+class LinkStream:
+    """Async iterator over a profile's links from a paged list.
+
+    If listing fails partway, the error is logged, iteration stops early and
+    ``truncated`` is set, so callers can tell the user the list is incomplete.
+    """
+
+    def __init__(self, slug: str, items: AsyncIterator):
+        self.slug = slug
+        self.truncated = False
+        self._items = items
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Link:
+        while True:
+            try:
+                item = await anext(self._items)
+            except StatelyError as e:
+                logger.error(f"Error listing links for '{self.slug}': {e}")
+                self.truncated = True
+                raise StopAsyncIteration
+            if isinstance(item, Link):
+                return item
+
+    async def aclose(self) -> None:
+        await self._items.aclose()
+
+
+async def stream_profile_and_links(slug: str, page_size: int = 100) -> tuple[Optional[Profile], LinkStream]:
+    """Get a profile and a lazy iterator over its links, in key order.
+
+    Only one list page is held in memory at a time, so callers that consume
+    the links incrementally stay bounded no matter how many links exist.
+    """
+    items = _iter_list(key_path("/p-{slug}", slug=slug), page_size)
+    # The profile's key sorts before all of its links, so it comes first
+    try:
+        profile = await anext(items, None)
+    except StatelyError as e:
+        logger.error(f"Error getting profile '{slug}': {e}")
+        profile = None
+    if not isinstance(profile, Profile):
+        await items.aclose()
+        profile = None
+    return profile, LinkStream(slug, items)
+
 
 async def get_link_by_id(link_id: int, profile_slug: str) -> Optional[Link]:
     """Get a specific link by ID within a profile."""
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .profiling import ASYNC_GEN_FRAME, ProfilingMiddleware, RequestProfiler, should_profile, timed
+
+
+@override_settings(PROFILE_TOKEN='', PROFILE_SAMPLE_RATE=0)
+class ShouldProfileTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_no_header(self):
+        self.assertFalse(should_profile(self.factory.get('/')))
+
+    @override_settings(PROFILE_TOKEN='secret')
+    def test_matching_token(self):
+        request = self.factory.get('/', headers={'X-Profile': 'secret'})
+        self.assertTrue(should_profile(request))
+
+    @override_settings(PROFILE_TOKEN='secret')
+    def test_wrong_token(self):
+        request = self.factory.get('/', headers={'X-Profile': 'guess'})
+        self.assertFalse(should_profile(request))
+
+    @override_settings(DEBUG=True)
+    def test_header_ignored_without_token(self):
+        request = self.factory.get('/', headers={'X-Profile': '1'})
+        self.assertFalse(should_profile(request))
+
+    @override_settings(PROFILE_SAMPLE_RATE=1)
+    def test_sample_rate(self):
+        self.assertTrue(should_profile(self.factory.get('/')))
+
+
+class TimedTest(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    def test_without_profiler(self):
+        self.request.profiler = None
+        with timed(self.request, 'render'):
+            pass
+
+    async def test_records_section(self):
+        self.request.profiler = RequestProfiler(self.request, 0.005)
+        with timed(self.request, 'render'):
+            await asyncio.sleep(0.01)
+        with timed(self.request, 'render'):
+            pass
+        self.assertEqual(list(self.request.profiler.sections), ['render'])
+        self.assertGreaterEqual(self.request.profiler.sections['render'], 0.01)
+
+
+class ProfilingMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = Path(tmp.name)
+        self.settings = override_settings(
+            PROFILE_TOKEN='secret',
+            PROFILE_SAMPLE_RATE=0,
+            PROFILE_INTERVAL_MS=1,
+            PROFILE_OUTPUT_DIR=self.output_dir,
+            PROFILE_MAX_DUMPS=2,
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+    async def get_response(self, request):
+        with timed(request, 'render'):
+            await asyncio.sleep(0.01)
+        return HttpResponse('ok')
+
+    async def test_unprofiled_request(self):
+        middleware = ProfilingMiddleware(self.get_response)
+        response = await middleware(self.factory.get('/'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    async def test_profiled_request(self):
+        middleware = ProfilingMiddleware(self.get_response)
+        response = await middleware(self.factory.get('/p/', headers={'X-Profile': 'secret'}))
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        summaries = list(self.output_dir.glob('*.json'))
+        self.assertEqual(len(summaries), 1)
+        summary = json.loads(summaries[0].read_text())
+        self.assertEqual(summary['path'], '/p/')
+        self.assertIn('render', summary['sections_ms'])
+        self.assertTrue(summaries[0].with_suffix('.collapsed').exists())
+
+    @override_settings(PROFILE_SAMPLE_RATE=1)
+    async def test_sampled_request_has_no_server_timing(self):
+        middleware = ProfilingMiddleware(self.get_response)
+        response = await middleware(self.factory.get('/'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(len(list(self.output_dir.glob('*.json'))), 1)
+
+    async def test_keeps_newest_dumps(self):
+        middleware = ProfilingMiddleware(self.get_response)
+        for _ in range(3):
+            await middleware(self.factory.get('/', headers={'X-Profile': 'secret'}))
+        self.assertEqual(len(list(self.output_dir.glob('*.json'))), 2)
+        self.assertEqual(len(list(self.output_dir.glob('*.collapsed'))), 2)
+
+    async def get_streaming_response(self, request):
+        async def body():
+            yield 'head'
+            with timed(request, 'render'):
+                await asyncio.sleep(0.01)
+            yield 'rows'
+        return StreamingHttpResponse(body())
+
+    async def test_streamed_body_is_profiled(self):
+        middleware = ProfilingMiddleware(self.get_streaming_response)
+        request = self.factory.get('/', headers={'X-Profile': 'secret'})
+        response = await middleware(request)
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+        self.assertEqual([chunk async for chunk in response.streaming_content], [b'head', b'rows'])
+        self.assertTrue(request.profiler._stopped.is_set())
+
+        summaries = list(self.output_dir.glob('*.json'))
+        self.assertEqual(len(summaries), 1)
+        self.assertIn('render', json.loads(summaries[0].read_text())['sections_ms'])
+
+    async def test_unsent_stream_finishes_with_task(self):
+        middleware = ProfilingMiddleware(self.get_streaming_response)
+        request = self.factory.get('/', headers={'X-Profile': 'secret'})
+        # The request's task ends without the body being iterated, as when
+        # sending the response is cancelled
+        await asyncio.create_task(middleware(request))
+
+        await asyncio.to_thread(request.profiler._thread.join, 1)
+        self.assertFalse(request.profiler._thread.is_alive())
+        self.assertTrue(request.profiler._stopped.is_set())
+        self.assertEqual(len(list(self.output_dir.glob('*.json'))), 1)
+
+
+class AwaitChainTest(SimpleTestCase):
+    async def test_async_generator_placeholder(self):
+        profiler = RequestProfiler(RequestFactory().get('/'), 1)
+
+        async def pages():
+            await asyncio.sleep(1)
+            yield
+
+        async def view():
+            async for _ in pages():
+                pass
+
+        async def middleware():
+            profiler.anchor = sys._getframe()
+            await view()
+
+        profiler.task = asyncio.create_task(middleware())
+        await asyncio.sleep(0)
+        chain = profiler._await_chain()
+        profiler.task.cancel()
+        await asyncio.gather(profiler.task, return_exceptions=True)
+
+        self.assertEqual(len(chain), 2)
+        self.assertTrue(chain[0].endswith('.view'))
+        self.assertEqual(chain[1], ASYNC_GEN_FRAME)
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from generated.stately_item_types import Link, Profile
+from statelydb.src.errors import StatelyError
+
+from . import stately_client
+
+
+class FakeStatelyError(StatelyError):
+    def __init__(self):
+        Exception.__init__(self, 'list failed')
+
+
+class FakeListResult:
+    def __init__(self, items, token, error=None):
+        self.items = items
+        self.token = token
+        self.error = error
+
+    async def __aiter__(self):
+        if self.error:
+            raise self.error
+        for item in self.items:
+            yield item
+
+
+class FakeClient:
+    """Serves items in pages the way begin_list/continue_list do."""
+
+    def __init__(self, items, page_size=100, fail_on_page=None):
+        self.pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+        self.fail_on_page = fail_on_page
+        self.list_calls = 0
+        self.puts = []
+
+    def _page(self, index):
+        self.list_calls += 1
+        token = SimpleNamespace(can_continue=index + 1 < len(self.pages), next_page=index + 1)
+        error = FakeStatelyError() if index == self.fail_on_page else None
+        return FakeListResult(self.pages[index], token, error)
+
+    async def begin_list(self, prefix, limit):
+        return self._page(0)
+
+    async def continue_list(self, token):
+        return self._page(token.next_page)
+
+    async def put(self, item):
+        self.puts.append(item)
+        return item
+
+
+def make_items(link_count, with_profile=True):
+    items = [Profile(id='creator', slug='creator', full_name='Creator')] if with_profile else []
+    items += [Link(id=i, order=i) for i in range(1, link_count + 1)]
+    return items
+
+
+class StatelyClientListTest(SimpleTestCase):
+    def use_client(self, client):
+        patcher = patch.object(stately_client.stately_client, 'client', client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return client
+
+    async def test_get_profile_and_links_pages_past_first_page(self):
+        client = self.use_client(FakeClient(make_items(250)))
+        profile, links = await stately_client.get_profile_and_links('creator')
+        self.assertEqual(profile.slug, 'creator')
+        self.assertEqual(len(links), 250)
+        self.assertEqual(client.list_calls, 3)
+
+    async def test_get_profile_and_links_error(self):
+        self.use_client(FakeClient(make_items(250), fail_on_page=2))
+        with self.assertLogs('app.stately_client', 'ERROR'):
+            self.assertEqual(await stately_client.get_profile_and_links('creator'), (None, []))
+
+    async def test_create_link_orders_after_every_page(self):
+        client = self.use_client(FakeClient(make_items(250)))
+        await stately_client.create_link('creator', 'New', 'https://example.com')
+        self.assertEqual(client.puts[0].order, 251)
+
+    async def test_stream_pages_through_links(self):
+        client = self.use_client(FakeClient(make_items(250)))
+        profile, links = await stately_client.stream_profile_and_links('creator')
+        self.assertEqual(profile.slug, 'creator')
+        # Pages are only fetched as the links are consumed
+        self.assertEqual(client.list_calls, 1)
+        self.assertEqual([link.id async for link in links], list(range(1, 251)))
+        self.assertEqual(client.list_calls, 3)
+        self.assertFalse(links.truncated)
+
+    async def test_stream_error_truncates(self):
+        self.use_client(FakeClient(make_items(250), fail_on_page=2))
+        profile, links = await stately_client.stream_profile_and_links('creator')
+        # The first page holds the profile and 99 links, the second 100 more
+        with self.assertLogs('app.stately_client', 'ERROR'):
+            self.assertEqual(len([link async for link in links]), 199)
+        self.assertTrue(links.truncated)
+
+    async def test_stream_missing_profile(self):
+        client = self.use_client(FakeClient(make_items(250, with_profile=False)))
+        profile, links = await stately_client.stream_profile_and_links('creator')
+        self.assertIsNone(profile)
+        # The list was closed after its first item, so nothing more is fetched
+        self.assertEqual([link async for link in links], [])
+        self.assertEqual(client.list_calls, 1)
@@ -0,0 +1,136 @@
+import re
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .views import (
+    LINK_ROWS_CHUNK_SIZE,
+    _stream_link_rows,
+    profile_edit,
+    render_profile_edit_page,
+    stream_profile_edit_page,
+)
+
+
+def make_profile():
+    return SimpleNamespace(id='creator', slug='creator', full_name='Creator', bio='', profile_image='🌟')
+
+
+def make_link(link_id, order, created_at=0):
+    return SimpleNamespace(
+        id=link_id,
+        title=f'Link {link_id}',
+        url=f'https://example.com/{link_id}',
+        emoji='🔗',
+        link_type='website',
+        description='',
+        order=order,
+        created_at=created_at,
+        click_count=0,
+    )
+
+
+class FakeLinkStream:
+    """Stands in for LinkStream, optionally failing after the given links."""
+
+    def __init__(self, links, fail=False):
+        self._links = iter(links)
+        self._fail = fail
+        self.truncated = False
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._links)
+        except StopIteration:
+            self.truncated = self._fail
+            raise StopAsyncIteration
+
+    async def aclose(self):
+        self.closed = True
+
+
+class StreamProfileEditTest(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/creator/edit/')
+        self.profile = make_profile()
+
+    async def stream(self, links, fail=False):
+        self.links = FakeLinkStream(links, fail)
+        response = stream_profile_edit_page(self.request, self.profile, self.links)
+        return [chunk.decode() async for chunk in response.streaming_content]
+
+    async def test_rows_are_chunked(self):
+        links = [make_link(i, i) for i in range(1, 2 * LINK_ROWS_CHUNK_SIZE + 51)]
+        chunks = await self.stream(links)
+
+        # Head, two full chunks, the remainder, then the tail
+        rows = [chunk.count('class="link-item"') for chunk in chunks]
+        self.assertEqual(rows, [0, LINK_ROWS_CHUNK_SIZE, LINK_ROWS_CHUNK_SIZE, 50, 0])
+        self.assertIn('id="sortable-links"', chunks[0])
+        self.assertIn('</script>', chunks[-1])
+        self.assertTrue(self.links.closed)
+
+    async def test_stream_closed_when_stopped_early(self):
+        links = FakeLinkStream([make_link(i, i) for i in range(1, LINK_ROWS_CHUNK_SIZE + 1)])
+        rows = _stream_link_rows(self.request, self.profile, links, 'head', 'tail')
+        self.assertEqual(await anext(rows), 'head')
+        await anext(rows)
+        await rows.aclose()
+        self.assertTrue(links.closed)
+
+    @override_settings(STREAM_PROFILE_EDIT=True)
+    async def test_stream_closed_when_post_fails(self):
+        links = FakeLinkStream([make_link(1, 1)])
+
+        async def stream_profile_and_links(slug):
+            return self.profile, links
+
+        async def rename_profile(slug, new_name):
+            raise RuntimeError('rename failed')
+
+        request = RequestFactory().post('/creator/edit/', {'profile_name': 'Renamed'})
+        with (
+            patch('app.views.stream_profile_and_links', stream_profile_and_links),
+            patch('app.views.rename_profile', rename_profile),
+            self.assertRaises(RuntimeError),
+        ):
+            await profile_edit(request, 'creator')
+        self.assertTrue(links.closed)
+
+    async def test_empty_list_placeholder(self):
+        body = ''.join(await self.stream([]))
+        self.assertIn('No links yet', body)
+        self.assertNotIn('class="links-truncated"', body)
+
+    async def test_truncated_list_is_flagged(self):
+        body = ''.join(await self.stream([make_link(1, 1), make_link(2, 2)], fail=True))
+        self.assertEqual(body.count('class="link-item"'), 2)
+        self.assertIn('class="links-truncated"', body)
+        self.assertNotIn('No links yet', body)
+
+    async def test_client_sort_matches_buffered_order(self):
+        # Key order differs from display order, with ties broken by created_at
+        links = [
+            make_link(1, 3, 100),
+            make_link(2, 1, 100),
+            make_link(3, 2, 100),
+            make_link(4, 1, 300),
+            make_link(5, 2, 0),
+            make_link(6, 1, 200),
+        ]
+        body = ''.join(await self.stream(links))
+        rows = re.findall(r'data-id="(\d+)" data-order="(\d+)" data-created="(\d+)"', body)
+        # Mirrors the comparator in profile_edit.html's streaming script
+        rows.sort(key=lambda row: (int(row[1]), -int(row[2])))
+        streamed = [int(row[0]) for row in rows]
+
+        buffered_body = render_profile_edit_page(self.request, self.profile, links).content.decode()
+        buffered = [int(link_id) for link_id in re.findall(r'class="link-item" data-id="(\d+)"', buffered_body)]
+
+        self.assertEqual(streamed, buffered)
+        self.assertEqual(buffered, [4, 6, 2, 3, 5, 1])
@@ -1,6 +1,8 @@
 # Django imports
+from django.conf import settings
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponseRedirect, Http404, HttpResponse
+from django.http import JsonResponse, HttpResponseRedirect, Http404, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.utils.text import slugify
@@ -10,6 +12,7 @@ from django.views.generic import TemplateView
 # StatelyDB client functions
 from .stately_client import (
     get_profile_and_links,
+    stream_profile_and_links,
     get_link_by_id,
     increment_profile_views,
     increment_link_clicks,
@@ -19,62 +22,146 @@ from .stately_client import (
     update_profile_bio,
     create_profile
 )
+from .profiling import timed
 import random
 
 
+# Placeholder in the streamed edit page shell where link rows are spliced in
+LINK_ROWS_MARKER = '<!-- link-rows -->'
+# Number of link rows rendered per streamed chunk
+LINK_ROWS_CHUNK_SIZE = 100
+
+EDIT_EMOJI_OPTIONS = ['🌟', '⚡', '🚀', '💎', '🔥', '🌈', '🎨', '🎭', '🎪', '🎯']
 
 
 # Main profile view - shows a user's profile page with their links
 async def profile_detail(request, slug):
     try:
-        profile, all_links = await get_profile_and_links(slug)
+        with timed(request, 'stately'):
+            profile, all_links = await get_profile_and_links(slug)
         if not profile or not profile.is_active:
             raise Http404("Profile not found")
         
         # Increment view count 
-        await increment_profile_views(slug)
-        
-        links = [link for link in all_links if link.is_active]
-        links.sort(key=lambda x: (x.order, -x.created_at if x.created_at else 0))
+        with timed(request, 'stately'):
+            await increment_profile_views(slug)
         
-        context = {
-            'profile': profile,
-            'links': links,
-            'total_clicks': sum(link.click_count for link in links),
-        }
-        return render(request, 'app/profile_detail.html', context)
+        with timed(request, 'context'):
+            links = [link for link in all_links if link.is_active]
+            links.sort(key=lambda x: (x.order, -x.created_at if x.created_at else 0))
+            
+            context = {
+                'profile': profile,
+                'links': links,
+                'total_clicks': sum(link.click_count for link in links),
+            }
+        with timed(request, 'render'):
+            return render(request, 'app/profile_detail.html', context)
     except Exception as e:
         messages.error(request, f"Error loading profile: {str(e)}")
         raise Http404("Profile not found")
 
 
 async def profile_edit(request, slug):
-    profile, all_links = await get_profile_and_links(slug)
+    with timed(request, 'stately'):
+        if settings.STREAM_PROFILE_EDIT:
+            profile, links = await stream_profile_and_links(slug)
+        else:
+            profile, links = await get_profile_and_links(slug)
     if not profile:
         raise Http404("Profile not found")
     
-    links = list(all_links)
-    links.sort(key=lambda x: (x.order, -x.created_at if x.created_at else 0))
-    
-    if request.method == 'POST':
-        # Update profile name
-        new_name = request.POST.get('profile_name', '').strip()
-        if new_name and new_name != profile.full_name:
-            await rename_profile(slug, new_name)
-            messages.success(request, 'Profile name updated!')
+    try:
+        if request.method == 'POST':
+            # Update profile name
+            new_name = request.POST.get('profile_name', '').strip()
+            if new_name and new_name != profile.full_name:
+                with timed(request, 'stately'):
+                    await rename_profile(slug, new_name)
+                messages.success(request, 'Profile name updated!')
+            
+            # Update profile bio
+            new_bio = request.POST.get('profile_bio', '').strip()
+            if new_bio != profile.bio:
+                with timed(request, 'stately'):
+                    await update_profile_bio(slug, new_bio)
+                messages.success(request, 'Profile bio updated!')
         
-        # Update profile bio
-        new_bio = request.POST.get('profile_bio', '').strip()
-        if new_bio != profile.bio:
-            await update_profile_bio(slug, new_bio)
-            messages.success(request, 'Profile bio updated!')
-    
+        if settings.STREAM_PROFILE_EDIT:
+            return stream_profile_edit_page(request, profile, links)
+    except BaseException:
+        # A stream that never reached a response still holds an open list call
+        if settings.STREAM_PROFILE_EDIT:
+            await links.aclose()
+        raise
+    return render_profile_edit_page(request, profile, links)
+
+
+def render_profile_edit_page(request, profile, all_links):
+    with timed(request, 'context'):
+        links = list(all_links)
+        links.sort(key=lambda x: (x.order, -x.created_at if x.created_at else 0))
+        
+        context = {
+            'profile': profile,
+            'links': links,
+            'emoji_options': EDIT_EMOJI_OPTIONS,
+        }
+    with timed(request, 'render'):
+        return render(request, 'app/profile_edit.html', context)
+
+
+def stream_profile_edit_page(request, profile, links):
+    """Stream the edit page, rendering link rows in chunks as they are listed.
+
+    The page shell is rendered up front so messages and the CSRF cookie are
+    settled before the response leaves the middleware. Rows are sent in key
+    order and sorted into display order by the page's script.
+    """
     context = {
         'profile': profile,
-        'links': links,
-        'emoji_options': ['🌟', '⚡', '🚀', '💎', '🔥', '🌈', '🎨', '🎭', '🎪', '🎯'],
+        'streaming': True,
+        'emoji_options': EDIT_EMOJI_OPTIONS,
     }
-    return render(request, 'app/profile_edit.html', context)
+    with timed(request, 'render'):
+        head, tail = render_to_string('app/profile_edit.html', context, request).split(LINK_ROWS_MARKER, 1)
+    return StreamingHttpResponse(_stream_link_rows(request, profile, links, head, tail))
+
+
+async def _stream_link_rows(request, profile, links, head, tail):
+    try:
+        yield head
+        
+        chunk = []
+        sent = 0
+        while True:
+            # Later list pages are fetched here, after the response has started
+            with timed(request, 'stately'):
+                link = await anext(links, None)
+            if link is None:
+                break
+            chunk.append(link)
+            if len(chunk) == LINK_ROWS_CHUNK_SIZE:
+                with timed(request, 'render'):
+                    rows = render_to_string('app/_link_rows.html', {'profile': profile, 'links': chunk}, request)
+                yield rows
+                sent += len(chunk)
+                chunk = []
+        
+        # An empty final chunk renders the "no links" placeholder
+        if chunk or not (sent or links.truncated):
+            with timed(request, 'render'):
+                rows = render_to_string('app/_link_rows.html', {'profile': profile, 'links': chunk}, request)
+            yield rows
+        
+        # The status is already sent, so flag the missing links in the page
+        if links.truncated:
+            yield render_to_string('app/_links_truncated.html', request=request)
+        
+        yield tail
+    finally:
+        # Close the list call on errors and disconnects, not just at the end
+        await links.aclose()
 
 
 async def add_link(request, slug):
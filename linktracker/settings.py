@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,4 +87,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # STATELY_STORE_ID=your_store_id
 # STATELY_ACCESS_KEY=your_access_key
 STATELY_STORE_ID = os.environ.get('STATELY_STORE_ID')
-STATELY_ACCESS_KEY = os.environ.get('STATELY_ACCESS_KEY')
\ No newline at end of file
+STATELY_ACCESS_KEY = os.environ.get('STATELY_ACCESS_KEY')
+
+# Stream the profile edit page, rendering link rows in chunks as they are
+# listed from StatelyDB instead of loading every link before the first byte
+STREAM_PROFILE_EDIT = os.environ.get('STREAM_PROFILE_EDIT', '').lower() in ('1', 'true', 'yes')
+
+# Request profiling
+# Requests are profiled when the PROFILE_HEADER header matches PROFILE_TOKEN
+# (the header is ignored while no token is set), or at random with
+# probability PROFILE_SAMPLE_RATE. Collapsed stacks and timing summaries are
+# written to PROFILE_OUTPUT_DIR, which keeps only the newest
+# PROFILE_MAX_DUMPS profiles.
+PROFILE_HEADER = 'X-Profile'
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+PROFILE_OUTPUT_DIR = Path(os.environ.get('PROFILE_OUTPUT_DIR', BASE_DIR / 'profiles'))
+PROFILE_MAX_DUMPS = int(os.environ.get('PROFILE_MAX_DUMPS', '100'))
\ No newline at end of file